@@ -1,104 +1,216 @@
 #!/usr/bin/env python3
 """Standalone camera preview window for PostureGuard. Launched as subprocess."""
 
+import queue
+import threading
+import time
+
 import cv2
 import mediapipe as mp
-import time
+import numpy as np
 
 from posture_core import (
-    CAMERA_INDEX, _init_mediapipe,
-    extract_metrics, compare_to_baseline, load_calibration, smooth_score,
+    CAMERA_INDEX, CHECK_INTERVAL, POSE_MODEL_COMPLEXITY, _init_mediapipe,
+    ISSUES, ScoreHistory, extract_metrics_array, score_posture, load_calibration,
+    metrics_array, open_camera,
 )
 
 mp_draw = mp.solutions.drawing_utils
 
+_POSE_LM_SPEC = mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=3)
+_POSE_CONN_SPEC = mp_draw.DrawingSpec(color=(0, 200, 0), thickness=2)
+_FACE_LM_SPEC = mp_draw.DrawingSpec(color=(0, 180, 180), thickness=1, circle_radius=1)
+_FACE_CONN_SPEC = mp_draw.DrawingSpec(color=(0, 150, 150), thickness=1)
+
+WINDOW_NAME = "PostureGuard Camera"
+QUEUE_SIZE = 2  # frames in flight between pipeline stages
+INFER_EVERY = 2  # run MediaPipe on every Nth frame, reuse landmarks in between
+STANDBY_AFTER = 15  # missed pose inferences before dropping to ~1 Hz standby
+
+
+def _put(q, item, stop):
+    """Blocking put that gives up once stop is set. Returns True if queued."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q, stop):
+    """Blocking get that returns None once stop is set."""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return None
+
+
+def _read_frames(cap, read_q, stop):
+    """Reader stage: pull BGR frames off the camera, stamped with capture time."""
+    while not stop.is_set():
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if not _put(read_q, (time.monotonic(), frame), stop):
+            return
+    _put(read_q, None, stop)
+
+
+def _infer_stride(fps):
+    """Frames between inferences, keeping at least one per CHECK_INTERVAL."""
+    return max(1, min(INFER_EVERY, int(fps * CHECK_INTERVAL)))
+
+
+def _run_inference(pose, face, read_q, draw_q, stop, stride=1, standby_stride=30):
+    """Inference stage: mirror, convert to RGB and run MediaPipe.
+
+    MediaPipe only runs on every `stride`-th frame; frames in between are
+    drawn with the last landmarks. Face mesh only runs when a pose was
+    found, and after STANDBY_AFTER misses in a row (user away) pose
+    detection drops to every `standby_stride`-th frame until it finds
+    someone again.
+    """
+    frame_idx = 0
+    miss_streak = 0
+    pose_r = face_r = None
+    rgb = None  # reused across frames; MediaPipe copies what it needs
+    while True:
+        item = _get(read_q, stop)
+        if item is None:
+            break
+        stamp, frame = item
+        frame = cv2.flip(frame, 1)
+        every = standby_stride if miss_streak > STANDBY_AFTER else stride
+        if frame_idx % every == 0:
+            if rgb is None or rgb.shape != frame.shape:
+                rgb = np.empty_like(frame)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+            pose_r = pose.process(rgb)
+            if pose_r.pose_landmarks:
+                miss_streak = 0
+                face_r = face.process(rgb)
+            else:
+                miss_streak += 1
+                face_r = None
+        frame_idx += 1
+        if not _put(draw_q, (stamp, frame, pose_r, face_r), stop):
+            return
+    _put(draw_q, None, stop)
+
+
+def _draw_hud(frame, score, issue_mask, deviations, stamp, calibrated=True):
+    """Draw the score bar, status line and issue labels onto frame."""
+    h, w, _ = frame.shape
+    bar_color = (0, 255, 0) if score > 70 else (0, 200, 255) if score > 40 else (0, 0, 255)
+    cv2.rectangle(frame, (10, 10), (10 + int(score * 2.5), 40), bar_color, -1)
+    cv2.rectangle(frame, (10, 10), (260, 40), (255, 255, 255), 2)
+    cv2.putText(frame, f"POSTURE: {score}%", (15, 33),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+
+    if issue_mask:
+        cv2.putText(frame, "BAD POSTURE", (10, 70),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+        if int(stamp * 2) & 1:  # 2 Hz flash off the capture timestamp
+            cv2.rectangle(frame, (0, 0), (w - 1, h - 1), (0, 0, 255), 8)
+        row = 0
+        for bit, (title, _) in enumerate(ISSUES):
+            if issue_mask >> bit & 1:
+                display = f"{title.upper()} ({deviations[bit]:.3f})"
+                cv2.putText(frame, display, (10, 100 + row * 28),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.55, (0, 0, 255), 2)
+                row += 1
+    else:
+        cv2.putText(frame, "LOOKING GOOD", (10, 70),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+
+    if not calibrated:
+        cv2.putText(frame, "NO CALIBRATION — use menu bar to calibrate", (10, h - 20),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+
 
 def main():
     _mp_pose, _mp_face = _init_mediapipe()
     baseline = load_calibration()
+    baseline_arr = metrics_array(baseline) if baseline else None
 
     pose = _mp_pose.Pose(
-        static_image_mode=False, model_complexity=1,
+        static_image_mode=False, model_complexity=POSE_MODEL_COMPLEXITY,
         smooth_landmarks=True, min_detection_confidence=0.6, min_tracking_confidence=0.6,
     )
     face = _mp_face.FaceMesh(
         static_image_mode=False, max_num_faces=1,
-        refine_landmarks=True, min_detection_confidence=0.6, min_tracking_confidence=0.6,
+        refine_landmarks=False, min_detection_confidence=0.6, min_tracking_confidence=0.6,
     )
 
-    cap = cv2.VideoCapture(CAMERA_INDEX)
-    if not cap.isOpened():
+    cap = open_camera(CAMERA_INDEX)
+    if cap is None:
         print("Cannot open camera")
         return
 
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-    score_history = []
+    score_history = ScoreHistory(max_len=30)
+
+    # reader -> inference -> render (main thread; macOS needs imshow here)
+    read_q = queue.Queue(maxsize=QUEUE_SIZE)
+    draw_q = queue.Queue(maxsize=QUEUE_SIZE)
+    stop = threading.Event()
+    reader = threading.Thread(target=_read_frames, args=(cap, read_q, stop), daemon=True)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    stride = _infer_stride(fps)
+    standby_stride = max(stride, int(fps))  # ~1 Hz while nobody is in frame
+    worker = threading.Thread(
+        target=_run_inference, args=(pose, face, read_q, draw_q, stop, stride, standby_stride),
+        daemon=True,
+    )
+    reader.start()
+    worker.start()
 
+    cv2.namedWindow(WINDOW_NAME)  # so WND_PROP_VISIBLE is valid from the first frame
     try:
         while True:
-            ret, frame = cap.read()
-            if not ret:
+            item = _get(draw_q, stop)
+            if item is None:
                 break
+            stamp, frame, pose_r, face_r = item
 
-            frame = cv2.flip(frame, 1)
-            h, w, _ = frame.shape
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            pose_r = pose.process(rgb)
-            face_r = face.process(rgb)
-
-            issues = []
+            issue_mask, deviations = 0, ()
             score = 100
+            # Drawing is skipped while the window is minimized/hidden; scoring still runs
+            visible = cv2.getWindowProperty(WINDOW_NAME, cv2.WND_PROP_VISIBLE) >= 1
 
             if pose_r.pose_landmarks:
-                mp_draw.draw_landmarks(
-                    frame, pose_r.pose_landmarks, _mp_pose.POSE_CONNECTIONS,
-                    mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=3),
-                    mp_draw.DrawingSpec(color=(0, 200, 0), thickness=2),
-                )
-                if face_r.multi_face_landmarks:
-                    for fl in face_r.multi_face_landmarks:
-                        mp_draw.draw_landmarks(
-                            frame, fl, _mp_face.FACEMESH_CONTOURS,
-                            mp_draw.DrawingSpec(color=(0, 180, 180), thickness=1, circle_radius=1),
-                            mp_draw.DrawingSpec(color=(0, 150, 150), thickness=1),
-                        )
+                if visible:
+                    mp_draw.draw_landmarks(
+                        frame, pose_r.pose_landmarks, _mp_pose.POSE_CONNECTIONS,
+                        _POSE_LM_SPEC, _POSE_CONN_SPEC,
+                    )
+                    if face_r.multi_face_landmarks:
+                        for fl in face_r.multi_face_landmarks:
+                            mp_draw.draw_landmarks(
+                                frame, fl, _mp_face.FACEMESH_CONTOURS,
+                                _FACE_LM_SPEC, _FACE_CONN_SPEC,
+                            )
 
                 face_lm = face_r.multi_face_landmarks[0].landmark if face_r.multi_face_landmarks else None
-                metrics = extract_metrics(pose_r.pose_landmarks.landmark, face_lm)
-
-                if metrics and baseline:
-                    issues, score = compare_to_baseline(metrics, baseline)
-                    score = smooth_score(score_history, score, max_len=30)
-
-            # HUD
-            bar_color = (0, 255, 0) if score > 70 else (0, 200, 255) if score > 40 else (0, 0, 255)
-            cv2.rectangle(frame, (10, 10), (10 + int(score * 2.5), 40), bar_color, -1)
-            cv2.rectangle(frame, (10, 10), (260, 40), (255, 255, 255), 2)
-            cv2.putText(frame, f"POSTURE: {score}%", (15, 33),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-
-            if issues:
-                cv2.putText(frame, "BAD POSTURE", (10, 70),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
-                if int(time.time() * 2) % 2:
-                    cv2.rectangle(frame, (0, 0), (w - 1, h - 1), (0, 0, 255), 8)
-                for i, (label, val) in enumerate(issues):
-                    display = f"{label.split('—')[0].strip().upper()} ({val:.3f})"
-                    cv2.putText(frame, display, (10, 100 + i * 28),
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.55, (0, 0, 255), 2)
-            else:
-                cv2.putText(frame, "LOOKING GOOD", (10, 70),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+                metrics = extract_metrics_array(pose_r.pose_landmarks.landmark, face_lm)
+
+                if metrics is not None and baseline_arr is not None:
+                    issue_mask, deviations, score = score_posture(metrics, baseline_arr)
+                    score = score_history.push(score)
 
-            if not baseline:
-                cv2.putText(frame, "NO CALIBRATION — use menu bar to calibrate", (10, h - 20),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+            if visible:
+                _draw_hud(frame, score, issue_mask, deviations, stamp, calibrated=bool(baseline))
 
-            cv2.imshow("PostureGuard Camera", frame)
+            cv2.imshow(WINDOW_NAME, frame)
             if cv2.waitKey(1) & 0xFF == ord('q'):
                 break
     finally:
+        stop.set()
+        reader.join()
+        worker.join()
         cap.release()
         cv2.destroyAllWindows()
         pose.close()
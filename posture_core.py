@@ -6,13 +6,33 @@ This module contains the core metric extraction, baseline comparison,
 and calibration I/O used by both the menu bar app and camera preview.
 """
 
+from __future__ import annotations
+
+import csv
+import glob
 import json
+import mmap
 import os
+import sys
+from collections import Counter, deque
+from itertools import groupby
+from typing import IO, Any, Callable, Iterable, Iterator, Mapping, NamedTuple, Optional, Protocol, Sequence
 
 import numpy as np
 
+orjson: Any
+try:
+    import orjson  # optional; faster calibration load at startup
+except ImportError:
+    orjson = None
+
 # --- Paths & camera ---
 CALIBRATION_FILE = os.path.expanduser("~/posture_calibration.json")
+LOG_DIR = os.path.expanduser("~/PostureGuard")
+LOG_FILE = os.path.join(LOG_DIR, "posture_log.csv")
+# Running totals for today, kept by the log writer so the summary needn't scan the CSV
+SUMMARY_FILE = os.path.join(LOG_DIR, "summary_today.json")
+SUMMARY_ARCHIVE_DAYS = 90  # summary_YYYY-MM-DD.json files kept; older ones are deleted
 CAMERA_INDEX = 0
 
 # --- Detection thresholds (Medium/default) ---
@@ -55,14 +75,106 @@ WEIGHT_FORWARD = 25
 CHECK_INTERVAL = 0.5  # seconds between posture checks
 BAD_POSTURE_SECONDS = 5
 COOLDOWN_SECONDS = 45
+# Capture rate requested by the menu bar app. It checks every 0.5s and
+# calibrates at ~15 fps, so decoding 30 fps in CaptureThread is wasted work.
+APP_CAMERA_FPS = 15
 
 # --- Visibility ---
 MIN_VISIBILITY = 0.4
 
+# --- Motion gate ---
+# Frames are compared at this (width, height) in grayscale; below a mean
+# absolute difference of MOTION_THRESHOLD (0-255 scale) the monitor reuses
+# the last landmarks instead of running MediaPipe.
+MOTION_SIZE = (64, 48)
+MOTION_THRESHOLD = 3.0
+
+# --- Models ---
+# Lite BlazePose (0) is ~2x cheaper than Full (1) and resolves the five
+# head/shoulder landmarks we use just as well at desk distance.
+POSE_MODEL_COMPLEXITY = 0
+# Frames are downscaled to this (width, height) before MediaPipe. Landmarks
+# are normalized to [0, 1], so metrics don't depend on the input size.
+INFER_SIZE = (480, 360)
+
+# --- Pose landmark indices (mp_pose.PoseLandmark, fixed by the BlazePose topology) ---
+# Plain ints avoid an IntEnum lookup per landmark per frame.
+_IDX_NOSE = 0
+_IDX_LEAR = 7
+_IDX_REAR = 8
+_IDX_LSH = 11
+_IDX_RSH = 12
+_POSE_IDX = (_IDX_NOSE, _IDX_LEAR, _IDX_REAR, _IDX_LSH, _IDX_RSH)
+# Row of each landmark in the (5, 3) array extract_metrics() builds
+_ROW_NOSE, _ROW_LEAR, _ROW_REAR, _ROW_LSH, _ROW_RSH = range(5)
+# Face mesh points read by extract_metrics: forehead, chin, left/right cheek
+_FACE_IDX = (10, 152, 234, 454)
+
+
+class Landmark(Protocol):
+    """Shape of a MediaPipe NormalizedLandmark as used by extract_metrics()."""
+    x: float
+    y: float
+    visibility: float
+
+
+class Metrics(NamedTuple):
+    """Normalized posture metrics for one frame (or an averaged baseline).
+
+    A NamedTuple rather than a dict: fields are read by offset instead of
+    hashing a string key, which matters in the per-frame comparison.
+    """
+    nose_to_shoulder_y: float
+    nose_to_shoulder_x: float
+    ear_shoulder_dist: float
+    shoulder_tilt: float
+    nose_to_ear_y: float
+    face_tilt: float
+    face_forward_ratio: float
+    nose_y: float
+    mid_ear_y: float
+    mid_shoulder_y: float
+
+
+# Fixed array layout of Metrics (field positions), for the scoring kernel
+I_NOSE_TO_SHOULDER_Y = 0
+I_NOSE_TO_SHOULDER_X = 1
+I_EAR_SHOULDER_DIST = 2
+I_SHOULDER_TILT = 3
+I_NOSE_TO_EAR_Y = 4
+I_FACE_TILT = 5
+I_FACE_FORWARD_RATIO = 6
+I_NOSE_Y = 7
+I_MID_EAR_Y = 8
+I_MID_SHOULDER_Y = 9
+# float64 on purpose: values arrive as Python floats and the kernels are
+# scalar over 10 elements, so float32 only adds conversions (and rounds
+# the JSON baseline) without any SIMD width to gain.
+METRIC_DTYPE = np.float64
+
+# --- Issues (bit positions in the scoring kernel's issue mask) ---
+IDX_HEAD = 0
+IDX_SLOUCH = 1
+IDX_LEAN_LEFT = 2
+IDX_LEAN_RIGHT = 3
+IDX_SHOULDER = 4
+IDX_FORWARD = 5
+
+# (short title, spoken phrase) per issue bit, for menu bar labels and alerts
+ISSUES = (
+    ("Head dropping", "chin up"),
+    ("Slouching", "sit up straight"),
+    ("Leaning left", "center up"),
+    ("Leaning right", "center up"),
+    ("Shoulders uneven", "level out"),
+    ("Leaning forward", "sit back"),
+)
+ISSUE_MESSAGES = tuple(f"{title} — {phrase}!" for title, phrase in ISSUES)
+
 # --- MediaPipe (lazy import — not needed for pure logic functions) ---
-_mp = None
-mp_pose = None
-mp_face = None
+_mp: Any = None
+mp_pose: Any = None
+mp_face: Any = None
 
 
 def _init_mediapipe():
@@ -76,7 +188,103 @@ def _init_mediapipe():
     return mp_pose, mp_face
 
 
-def extract_metrics(pose_landmarks, face_landmarks=None):
+def open_camera(
+    index: int = CAMERA_INDEX, width: int = 640, height: int = 480, fps: Optional[int] = None,
+) -> Any:
+    """Open the webcam for low-latency reads. Returns a VideoCapture or None.
+
+    The driver buffer is cut to one frame so reads aren't served from a
+    backlog of stale frames, and MJPG is requested to skip the driver's
+    raw YUY2 -> BGR conversion where the camera supports it. On macOS the
+    AVFoundation backend is pinned rather than left to CAP_ANY. fps, if
+    given, asks the driver for a lower frame rate (fewer frames decoded).
+    """
+    import cv2
+    if sys.platform == 'darwin':
+        cap = cv2.VideoCapture(index, cv2.CAP_AVFOUNDATION)
+    else:
+        cap = cv2.VideoCapture(index)
+    if not cap.isOpened():
+        cap.release()
+        return None
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    if fps:
+        cap.set(cv2.CAP_PROP_FPS, fps)
+    return cap
+
+
+def _metrics_kernel(pts, face_x, out):
+    """Fill out (Metrics layout) from a (5, 3) x/y/visibility landmark array.
+
+    face_x holds the x of forehead, chin, left and right cheek, or is empty
+    without a face mesh. Written so numba can compile it, like
+    _score_kernel(). Returns False if a key landmark isn't visible enough.
+    """
+    for row in range(pts.shape[0]):
+        if pts[row, 2] < MIN_VISIBILITY:
+            return False
+
+    nose_x = pts[_ROW_NOSE, 0]
+    nose_y = pts[_ROW_NOSE, 1]
+    mid_ear_y = (pts[_ROW_LEAR, 1] + pts[_ROW_REAR, 1]) / 2
+    mid_shoulder_x = (pts[_ROW_LSH, 0] + pts[_ROW_RSH, 0]) / 2
+    mid_shoulder_y = (pts[_ROW_LSH, 1] + pts[_ROW_RSH, 1]) / 2
+
+    out[I_NOSE_TO_SHOULDER_Y] = nose_y - mid_shoulder_y
+    out[I_NOSE_TO_SHOULDER_X] = nose_x - mid_shoulder_x
+    out[I_EAR_SHOULDER_DIST] = mid_shoulder_y - mid_ear_y
+    out[I_SHOULDER_TILT] = pts[_ROW_LSH, 1] - pts[_ROW_RSH, 1]
+    out[I_NOSE_TO_EAR_Y] = nose_y - mid_ear_y
+    out[I_NOSE_Y] = nose_y
+    out[I_MID_EAR_Y] = mid_ear_y
+    out[I_MID_SHOULDER_Y] = mid_shoulder_y
+    if face_x.shape[0]:
+        out[I_FACE_TILT] = face_x[0] - face_x[1]
+        out[I_FACE_FORWARD_RATIO] = abs(face_x[2] - face_x[3])
+    else:
+        out[I_FACE_TILT] = 0.0
+        out[I_FACE_FORWARD_RATIO] = 0.0
+    return True
+
+
+_NO_FACE = np.zeros(0, dtype=METRIC_DTYPE)
+
+
+def extract_metrics_array(
+    pose_landmarks: Sequence[Landmark],
+    face_landmarks: Optional[Sequence[Landmark]] = None,
+) -> Optional[np.ndarray]:
+    """Like extract_metrics(), but returns a metrics_array for scoring.
+
+    Skips building the Metrics tuple, so monitoring goes from landmarks to
+    its make_scorer() scorer (the preview, to score_posture()) without
+    leaving arrays.
+    """
+    # Read each needed landmark's x/y/visibility exactly once (each is a
+    # protobuf crossing) into one flat list, then one array copy; cheaper
+    # than a list of per-landmark tuples or filling a buffer row by row.
+    flat: list[float] = []
+    for i in _POSE_IDX:
+        p = pose_landmarks[i]
+        flat += (p.x, p.y, p.visibility)
+    pts = np.array(flat, dtype=METRIC_DTYPE).reshape(len(_POSE_IDX), 3)
+    face_x = _NO_FACE
+    if face_landmarks:
+        face_x = np.array([face_landmarks[i].x for i in _FACE_IDX], dtype=METRIC_DTYPE)
+
+    out = np.empty(len(Metrics._fields), dtype=METRIC_DTYPE)
+    if not _init_metrics_kernel()(pts, face_x, out):
+        return None
+    return out
+
+
+def extract_metrics(
+    pose_landmarks: Sequence[Landmark],
+    face_landmarks: Optional[Sequence[Landmark]] = None,
+) -> Optional[Metrics]:
     """Extract normalized posture metrics from MediaPipe landmarks.
 
     Args:
@@ -84,134 +292,240 @@ def extract_metrics(pose_landmarks, face_landmarks=None):
         face_landmarks: Optional list of face mesh landmarks.
 
     Returns:
-        Dict of metric name -> float, or None if key landmarks aren't visible.
+        Metrics, or None if key landmarks aren't visible.
     """
-    pose, _ = _init_mediapipe()
-    lm = pose_landmarks
-    nose = lm[pose.PoseLandmark.NOSE]
-    left_ear = lm[pose.PoseLandmark.LEFT_EAR]
-    right_ear = lm[pose.PoseLandmark.RIGHT_EAR]
-    left_shoulder = lm[pose.PoseLandmark.LEFT_SHOULDER]
-    right_shoulder = lm[pose.PoseLandmark.RIGHT_SHOULDER]
-
-    if any(p.visibility < MIN_VISIBILITY for p in [nose, left_ear, right_ear, left_shoulder, right_shoulder]):
+    values = extract_metrics_array(pose_landmarks, face_landmarks)
+    if values is None:
         return None
+    return Metrics(*values.tolist())
 
-    mid_shoulder_y = (left_shoulder.y + right_shoulder.y) / 2
-    mid_shoulder_x = (left_shoulder.x + right_shoulder.x) / 2
-    mid_ear_y = (left_ear.y + right_ear.y) / 2
 
-    face_tilt = 0.0
-    face_forward_ratio = 0.0
-    if face_landmarks:
-        forehead = face_landmarks[10]
-        chin = face_landmarks[152]
-        face_tilt = forehead.x - chin.x
-        left_cheek = face_landmarks[234]
-        right_cheek = face_landmarks[454]
-        face_forward_ratio = abs(left_cheek.x - right_cheek.x)
-
-    return {
-        "nose_to_shoulder_y": nose.y - mid_shoulder_y,
-        "nose_to_shoulder_x": nose.x - mid_shoulder_x,
-        "ear_shoulder_dist": mid_shoulder_y - mid_ear_y,
-        "shoulder_tilt": left_shoulder.y - right_shoulder.y,
-        "nose_to_ear_y": nose.y - mid_ear_y,
-        "face_tilt": face_tilt,
-        "face_forward_ratio": face_forward_ratio,
-        "nose_y": nose.y,
-        "mid_ear_y": mid_ear_y,
-        "mid_shoulder_y": mid_shoulder_y,
-    }
-
-
-def compare_to_baseline(current, baseline, thresholds=None):
-    """Compare current metrics against calibrated baseline.
+def metrics_array(metrics: Any) -> np.ndarray:
+    """Metrics (or an existing metrics array) as a METRIC_DTYPE array.
 
-    Args:
-        current: Dict of current metric values.
-        baseline: Dict of baseline metric values from calibration.
-        thresholds: Optional dict overriding default thresholds.
-            Keys: THRESH_HEAD_DROP, THRESH_SLOUCH, THRESH_HEAD_FORWARD, THRESH_SHOULDER_TILT.
+    No copy if it already is one, so callers can convert the baseline once
+    and pass the array on every frame.
+    """
+    return np.asarray(metrics, dtype=METRIC_DTYPE)
+
+
+def _score_kernel(cur, base, t_head, t_slouch, t_lean, t_shoulder):
+    """Pure-numeric baseline comparison over two metrics arrays.
+
+    Written so numba can compile it; see _init_score_kernel(). The checks
+    stay scalar on purpose: with only five of them, building NumPy
+    temporaries for a vectorized compare costs more than the branches,
+    compiled or not.
 
     Returns:
-        Tuple of (issues: list[str], score: int 0-100).
+        (penalty, issue_mask, deviations) where deviations holds the value
+        reported for each issue bit, in bit order.
     """
-    t_head = (thresholds or {}).get('THRESH_HEAD_DROP', THRESH_HEAD_DROP)
-    t_slouch = (thresholds or {}).get('THRESH_SLOUCH', THRESH_SLOUCH)
-    t_lean = (thresholds or {}).get('THRESH_HEAD_FORWARD', THRESH_HEAD_FORWARD)
-    t_shoulder = (thresholds or {}).get('THRESH_SHOULDER_TILT', THRESH_SHOULDER_TILT)
-
-    issues = []
-    penalty = 0
+    penalty = 0.0
+    mask = 0
+    diff = cur - base
 
     # Head drop
-    head_drop = current["nose_to_shoulder_y"] - baseline["nose_to_shoulder_y"]
+    head_drop = diff[I_NOSE_TO_SHOULDER_Y]
     if head_drop > t_head:
         severity = min(1.0, head_drop / (t_head * 3))
         penalty += severity * WEIGHT_HEAD_DROP
-        issues.append(("Head dropping — chin up!", head_drop))
+        mask |= 1 << IDX_HEAD
 
     # Slouch
-    slouch = baseline["ear_shoulder_dist"] - current["ear_shoulder_dist"]
+    slouch = -diff[I_EAR_SHOULDER_DIST]
     if slouch > t_slouch:
         severity = min(1.0, slouch / (t_slouch * 3))
         penalty += severity * WEIGHT_SLOUCH
-        issues.append(("Slouching — sit up straight!", slouch))
+        mask |= 1 << IDX_SLOUCH
 
     # Lateral lean
-    baseline_offset = baseline["nose_to_shoulder_x"]
-    current_offset = current["nose_to_shoulder_x"]
-    lateral_drift = abs(current_offset - baseline_offset)
+    offset = diff[I_NOSE_TO_SHOULDER_X]
+    lateral_drift = abs(offset)
     if lateral_drift > t_lean:
         severity = min(1.0, lateral_drift / (t_lean * 3))
         penalty += severity * WEIGHT_LEAN
-        direction = "left" if (current_offset - baseline_offset) < 0 else "right"
-        issues.append((f"Leaning {direction} — center up!", lateral_drift))
+        mask |= 1 << (IDX_LEAN_LEFT if offset < 0 else IDX_LEAN_RIGHT)
 
     # Shoulder tilt
-    if abs(current["shoulder_tilt"]) > t_shoulder:
-        tilt_diff = abs(current["shoulder_tilt"]) - abs(baseline["shoulder_tilt"])
+    tilt = abs(cur[I_SHOULDER_TILT])
+    if tilt > t_shoulder:
+        tilt_diff = tilt - abs(base[I_SHOULDER_TILT])
         if tilt_diff > 0.01:
-            severity = min(1.0, abs(current["shoulder_tilt"]) / (t_shoulder * 3))
+            severity = min(1.0, tilt / (t_shoulder * 3))
             penalty += severity * WEIGHT_SHOULDER
-            issues.append(("Shoulders uneven — level out!", abs(current["shoulder_tilt"])))
+            mask |= 1 << IDX_SHOULDER
 
     # Forward lean (face width ratio)
-    if current["face_forward_ratio"] > 0 and baseline.get("face_forward_ratio", 0) > 0:
-        forward = current["face_forward_ratio"] - baseline["face_forward_ratio"]
+    forward = 0.0
+    if cur[I_FACE_FORWARD_RATIO] > 0 and base[I_FACE_FORWARD_RATIO] > 0:
+        forward = diff[I_FACE_FORWARD_RATIO]
         if forward > 0.03:
             severity = min(1.0, forward / 0.09)
             penalty += severity * WEIGHT_FORWARD
-            issues.append(("Leaning forward — sit back!", forward))
+            mask |= 1 << IDX_FORWARD
+
+    return penalty, mask, (head_drop, slouch, lateral_drift, lateral_drift, tilt, forward)
+
+
+_compiled_kernel: Optional[Callable[..., Any]] = None
+_compiled_metrics_kernel: Optional[Callable[..., Any]] = None
+
+
+def _jit(kernel: Callable[..., Any]) -> Callable[..., Any]:
+    """numba.njit(kernel) if numba is installed, else kernel unchanged."""
+    try:
+        import numba
+    except ImportError:
+        return kernel
+    # numba needs Python bytecode; a mypyc-compiled build has none
+    if not hasattr(kernel, '__code__'):
+        return kernel
+    return numba.njit(cache=True)(kernel)
+
+
+def _init_score_kernel():
+    """Lazy-compile _score_kernel with numba if installed, else use it as-is."""
+    global _compiled_kernel
+    if _compiled_kernel is None:
+        _compiled_kernel = _jit(_score_kernel)
+    return _compiled_kernel
+
+
+def _init_metrics_kernel():
+    """Lazy-compile _metrics_kernel, same rules as _init_score_kernel()."""
+    global _compiled_metrics_kernel
+    if _compiled_metrics_kernel is None:
+        _compiled_metrics_kernel = _jit(_metrics_kernel)
+    return _compiled_metrics_kernel
+
+
+def resolve_thresholds(thresholds: Optional[Mapping[str, float]] = None) -> tuple[float, float, float, float]:
+    """Threshold overrides as the (head, slouch, lean, shoulder) tuple the kernel takes.
+
+    Resolve once when sensitivity changes and pass the tuple to
+    score_posture() to skip the per-check dict lookups.
+    """
+    t = thresholds or {}
+    return (
+        t.get('THRESH_HEAD_DROP', THRESH_HEAD_DROP),
+        t.get('THRESH_SLOUCH', THRESH_SLOUCH),
+        t.get('THRESH_HEAD_FORWARD', THRESH_HEAD_FORWARD),
+        t.get('THRESH_SHOULDER_TILT', THRESH_SHOULDER_TILT),
+    )
+
+
+def score_posture(
+    current: Any,
+    baseline: Any,
+    thresholds: Optional[Mapping[str, float] | tuple[float, float, float, float]] = None,
+) -> tuple[int, Sequence[float], int]:
+    """compare_to_baseline() without building the issue list.
+
+    thresholds may also be a tuple from resolve_thresholds().
+
+    Returns:
+        Tuple of (issue_mask, deviations, score: int 0-100). Bits are the
+        IDX_* constants; deviations holds each bit's value, in bit order.
+    """
+    if not isinstance(thresholds, tuple):
+        thresholds = resolve_thresholds(thresholds)
+    penalty, mask, deviations = _init_score_kernel()(
+        metrics_array(current), metrics_array(baseline), *thresholds,
+    )
+    return mask, deviations, max(0, int(100 - penalty))
+
+
+def make_scorer(
+    baseline: Any,
+    thresholds: Optional[Mapping[str, float] | tuple[float, float, float, float]] = None,
+) -> Callable[[Any], tuple[int, Sequence[float], int]]:
+    """score_posture() with baseline and thresholds bound once.
+
+    Rebuild it after calibration or a sensitivity change; each call then
+    goes straight to the kernel with the cached baseline array and
+    threshold values.
+    """
+    if not isinstance(thresholds, tuple):
+        thresholds = resolve_thresholds(thresholds)
+    kernel = _init_score_kernel()
+    base = metrics_array(baseline)
+    t_head, t_slouch, t_lean, t_shoulder = thresholds
+
+    def scorer(current: Any) -> tuple[int, Sequence[float], int]:
+        penalty, mask, deviations = kernel(
+            metrics_array(current), base, t_head, t_slouch, t_lean, t_shoulder,
+        )
+        return mask, deviations, max(0, int(100 - penalty))
+
+    return scorer
+
+
+def first_issue(mask: int) -> int:
+    """Lowest set bit of an issue mask (the headline issue), or -1 if none."""
+    return (mask & -mask).bit_length() - 1
 
-    score = max(0, int(100 - penalty))
+
+def compare_to_baseline(
+    current: Any,
+    baseline: Any,
+    thresholds: Optional[Mapping[str, float]] = None,
+) -> tuple[list[tuple[str, float]], int]:
+    """Compare current metrics against calibrated baseline.
+
+    Args:
+        current: Metrics (or metrics_array) for the current frame.
+        baseline: Metrics (or metrics_array) from calibration.
+        thresholds: Optional dict overriding default thresholds.
+            Keys: THRESH_HEAD_DROP, THRESH_SLOUCH, THRESH_HEAD_FORWARD, THRESH_SHOULDER_TILT.
+
+    Returns:
+        Tuple of (issues: list[tuple[str, float]], score: int 0-100).
+    """
+    mask, deviations, score = score_posture(current, baseline, thresholds)
+
+    issues: list[tuple[str, float]] = []
+    if mask:
+        for i, message in enumerate(ISSUE_MESSAGES):
+            if mask >> i & 1:
+                issues.append((message, float(deviations[i])))
     return issues, score
 
 
-def load_calibration():
-    """Load calibration baseline from disk. Returns dict or None."""
-    if os.path.exists(CALIBRATION_FILE):
-        with open(CALIBRATION_FILE) as f:
-            return json.load(f)
-    return None
+def frame_motion(prev: np.ndarray, current: np.ndarray) -> float:
+    """Mean absolute difference between two same-shape uint8 grayscale frames."""
+    return float(np.abs(current.astype(np.int16) - prev).mean())
+
 
+def load_calibration() -> Optional[Metrics]:
+    """Load calibration baseline from disk. Returns Metrics or None."""
+    try:
+        with open(CALIBRATION_FILE, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    return Metrics(**(orjson.loads(data) if orjson else json.loads(data)))
 
-def save_calibration(metrics):
-    """Save calibration baseline to disk."""
-    with open(CALIBRATION_FILE, 'w') as f:
-        json.dump(metrics, f, indent=2)
 
+def save_calibration(metrics: Metrics) -> None:
+    """Save calibration baseline (Metrics) to disk."""
+    if orjson:
+        data = orjson.dumps(metrics._asdict(), option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(metrics._asdict(), indent=2).encode()
+    with open(CALIBRATION_FILE, 'wb') as f:
+        f.write(data)
 
-def average_metrics(frames):
-    """Average a list of metric dicts into a single baseline dict."""
-    baseline = {}
-    for key in frames[0]:
-        baseline[key] = float(np.mean([f[key] for f in frames]))
-    return baseline
 
+def average_metrics(frames: Sequence[Metrics]) -> Metrics:
+    """Average a list of Metrics into a single baseline Metrics."""
+    n, k = len(frames), len(Metrics._fields)
+    arr = np.fromiter((v for f in frames for v in f), dtype=np.float64, count=n * k)
+    means = arr.reshape(n, k).mean(axis=0)
+    return Metrics(*means.tolist())
 
-def smooth_score(score_history, new_score, max_len=20):
+
+def smooth_score(score_history: list[int], new_score: int, max_len: int = 20) -> int:
     """Append a score and return the smoothed (averaged) value.
 
     Mutates score_history in place. Returns the smoothed int score.
@@ -219,4 +533,210 @@ def smooth_score(score_history, new_score, max_len=20):
     score_history.append(new_score)
     if len(score_history) > max_len:
         score_history.pop(0)
-    return int(np.mean(score_history))
+    return sum(score_history) // len(score_history)
+
+
+class ScoreHistory:
+    """Rolling window of scores with an O(1) running mean.
+
+    Drop-in for the list + smooth_score() pair in per-frame loops:
+    push() appends a score and returns the smoothed int score. A bounded
+    deque plus running sum beats a NumPy int16 ring here: at 20 scores,
+    per-element NumPy stores and reads cost more than they save.
+    """
+
+    def __init__(self, max_len: int = 20) -> None:
+        self._scores: deque[int] = deque(maxlen=max_len)
+        self._total = 0
+
+    def push(self, new_score: int) -> int:
+        scores = self._scores
+        if len(scores) == scores.maxlen:
+            self._total -= scores[0]
+        scores.append(new_score)
+        self._total += new_score
+        return self._total // len(scores)
+
+    def clear(self) -> None:
+        self._scores.clear()
+        self._total = 0
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._scores)
+
+
+def tail_lines(path: str, prefix: str, block: int = 64 * 1024) -> list[str]:
+    """Decoded lines at the end of path that start with prefix.
+
+    The log is append-only in time order, so today's rows are a suffix of
+    the file. The file is mmapped and stepped back a block at a time, to
+    the start of a line, until that line lacks the prefix; a byte find
+    then locates the first matching row. Only today's rows (plus a block)
+    are touched, and nothing earlier is read or decoded.
+    """
+    key = prefix.encode()
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return []  # mmap can't map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = len(mm)
+            while pos > 0:
+                pos = mm.rfind(b'\n', 0, max(pos - block, 0)) + 1
+                if mm[pos:pos + len(key)] != key:
+                    break
+            if mm[pos:pos + len(key)] != key:
+                pos = mm.find(b'\n' + key, pos) + 1
+                if not pos:
+                    return []
+            tail = mm[pos:]
+    return [line.decode() for line in tail.split(b'\n') if line.startswith(key)]
+
+
+def save_day_stats(path: str, stats: dict[str, Any]) -> None:
+    """Replace path atomically, so readers never see a half-written file."""
+    tmp = path + ".tmp"
+    with open(tmp, 'w') as f:
+        json.dump(stats, f)
+    os.replace(tmp, path)
+
+
+def add_reading(stats: dict[str, Any], score: int, labels: Iterable[str]) -> None:
+    """Count one logged reading (issue titles in labels) into day totals."""
+    stats['count'] += 1
+    stats['sum_score'] += score
+    stats['good_count'] += score > 80
+    stats['issue_counts'].update(labels)
+
+
+def scan_day_stats(day: str, log_path: str) -> dict[str, Any]:
+    """Totals for day rebuilt from the tail of the CSV log."""
+    stats: dict[str, Any] = {'date': day, 'count': 0, 'sum_score': 0, 'good_count': 0, 'issue_counts': Counter()}
+    if not os.path.exists(log_path):
+        return stats
+    for row in csv.reader(tail_lines(log_path, day)):
+        try:
+            score = int(row[1])
+        except (ValueError, IndexError):
+            continue
+        labels = row[2].split("; ") if len(row) > 2 and row[2] else ()
+        add_reading(stats, score, (issue.partition("—")[0].rstrip() for issue in labels))
+    return stats
+
+
+def _read_sidecar(summary_path: str) -> Optional[dict[str, Any]]:
+    """Totals saved in the sidecar, or None if it's missing or malformed."""
+    try:
+        with open(summary_path) as f:
+            stats = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not (isinstance(stats, dict) and isinstance(stats.get('date'), str)
+            and all(isinstance(stats.get(k), int) for k in ('count', 'sum_score', 'good_count'))
+            and isinstance(stats.get('issue_counts'), dict)
+            and all(isinstance(n, int) for n in stats['issue_counts'].values())):
+        return None
+    stats['issue_counts'] = Counter(stats['issue_counts'])
+    return stats
+
+
+def load_day_stats(day: str, log_path: str = LOG_FILE, summary_path: str = SUMMARY_FILE) -> dict[str, Any]:
+    """Totals for day from the sidecar, or from the log if it's missing or stale."""
+    stats = _read_sidecar(summary_path)
+    if stats is not None and stats['date'] == day:
+        return stats
+    return scan_day_stats(day, log_path)
+
+
+def _archive_path(summary_path: str, day: str) -> str:
+    return os.path.join(os.path.dirname(summary_path), f"summary_{day}.json")
+
+
+def _prune_archives(summary_path: str, keep: int) -> None:
+    """Delete all but the newest keep day archives next to summary_path."""
+    pattern = os.path.join(glob.escape(os.path.dirname(summary_path)), "summary_????-??-??.json")
+    archives = sorted(glob.glob(pattern))  # names sort by date
+    for path in archives[:max(len(archives) - keep, 0)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def roll_day_stats(
+    stats: Optional[dict[str, Any]], day: str, log_path: str, summary_path: str,
+) -> dict[str, Any]:
+    """The log writer's totals for day, archiving the finished day first.
+
+    stats is the writer's running totals, or None right after it starts.
+    An earlier day is kept as summary_YYYY-MM-DD.json next to the sidecar
+    when the running writer crosses midnight, and also on start when the
+    sidecar is left over from an earlier day (the app was quit or
+    restarted before midnight). Only the newest SUMMARY_ARCHIVE_DAYS
+    archives are kept.
+    """
+    if stats is None:
+        stats = _read_sidecar(summary_path)
+    if stats is not None:
+        if stats['date'] == day:
+            return stats
+        if stats['date'] < day:
+            save_day_stats(_archive_path(summary_path, stats['date']), stats)
+            _prune_archives(summary_path, SUMMARY_ARCHIVE_DAYS)
+    return scan_day_stats(day, log_path)
+
+
+class DayLog:
+    """Appends readings to the CSV log and keeps the day's totals beside it.
+
+    append() takes (timestamp, score, issue_mask) readings. They are
+    counted into stats, and the sidecar saved, only once their rows are
+    flushed to the CSV, so the sidecar never counts rows the log lacks.
+    A failed write closes the handle, so the next append reopens the file
+    and writes the header if it is new, and the OSError is re-raised with
+    the readings uncounted.
+    """
+
+    def __init__(self, path: str = LOG_FILE, summary_path: str = SUMMARY_FILE) -> None:
+        self.path = path
+        self.summary_path = summary_path
+        self.stats: Optional[dict[str, Any]] = None
+        self._fh: Optional[IO[str]] = None
+        self._writer: Any = None
+
+    def append(self, readings: Sequence[tuple[str, int, int]]) -> None:
+        for day, group in groupby(readings, key=lambda r: r[0][:10]):
+            run = list(group)
+            if self.stats is None or self.stats['date'] != day:
+                self.stats = roll_day_stats(self.stats, day, self.path, self.summary_path)
+            try:
+                self._write_rows(run)
+            except OSError:
+                self.close()
+                raise
+            for _, score, mask in run:
+                add_reading(self.stats, score, (title for i, (title, _) in enumerate(ISSUES) if mask >> i & 1))
+            save_day_stats(self.summary_path, self.stats)
+
+    def _write_rows(self, readings: list[tuple[str, int, int]]) -> None:
+        if self._fh is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._fh = open(self.path, 'a', newline='')
+            self._writer = csv.writer(self._fh)
+            if self._fh.tell() == 0:
+                self._writer.writerow(["timestamp", "score", "issues"])
+        self._writer.writerows(
+            (stamp, score, "; ".join(msg for i, msg in enumerate(ISSUE_MESSAGES) if mask >> i & 1))
+            for stamp, score, mask in readings
+        )
+        self._fh.flush()
+
+    def close(self) -> None:
+        fh, self._fh = self._fh, None
+        if fh is not None:
+            try:
+                fh.close()
+            except OSError:
+                pass  # a buffer that failed to flush just now fails again
@@ -7,47 +7,229 @@ No window, no dock icon, just silent judgment.
 """
 
 import rumps
-import cv2
 import numpy as np
 import subprocess
 import threading
 import time
-import csv
+import queue
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from posture_core import (
-    CALIBRATION_FILE, CAMERA_INDEX, CHECK_INTERVAL,
+    APP_CAMERA_FPS, CALIBRATION_FILE, CAMERA_INDEX, CHECK_INTERVAL, INFER_SIZE, POSE_MODEL_COMPLEXITY,
     BAD_POSTURE_SECONDS, COOLDOWN_SECONDS,
     SENSITIVITY_PRESETS, _init_mediapipe,
-    extract_metrics, compare_to_baseline, load_calibration,
-    save_calibration, average_metrics, smooth_score,
+    ISSUES, ISSUE_MESSAGES, first_issue, resolve_thresholds, make_scorer,
+    extract_metrics, extract_metrics_array, load_calibration,
+    save_calibration, average_metrics, open_camera, ScoreHistory,
+    MOTION_SIZE, MOTION_THRESHOLD, frame_motion,
+    LOG_FILE, SUMMARY_FILE, DayLog, load_day_stats,
 )
 
 __version__ = "1.1.0"
 
-LOG_DIR = os.path.expanduser("~/PostureGuard")
-LOG_FILE = os.path.join(LOG_DIR, "posture_log.csv")
+UI_FLUSH_INTERVAL = 0.5  # seconds between menu bar updates while monitoring
+UI_IDLE_INTERVAL = 2.0  # ... and while paused, when little changes
 
+LOG_FLUSH_ROWS = 32  # readings buffered before an append (~90 s at one per 3 s)
+LOG_QUEUE_SIZE = 256
 
-def say(text):
-    subprocess.Popen(["say", "-v", "Samantha", "-r", "210", text])
 
+SAY_VOICE = "com.apple.voice.compact.en-US.Samantha"
+SAY_RATE = 0.55  # AVSpeechUtterance scale (0.5 is default); ~ `say -r 210`
 
-def _ensure_log_dir():
-    os.makedirs(LOG_DIR, exist_ok=True)
+# --- Speech (lazy import — pyobjc's AVFoundation is optional) ---
+_avf = None
+_synth = None
+_voice = None
+_say_proc = None  # fallback `say` process, at most one at a time
 
 
-def log_posture(score, issues):
-    """Append a timestamped posture reading to the CSV log."""
-    _ensure_log_dir()
-    write_header = not os.path.exists(LOG_FILE)
-    with open(LOG_FILE, 'a', newline='') as f:
-        writer = csv.writer(f)
-        if write_header:
-            writer.writerow(["timestamp", "score", "issues"])
-        issue_text = "; ".join(msg for msg, _ in issues) if issues else ""
-        writer.writerow([datetime.now().isoformat(), score, issue_text])
+def _init_speech():
+    """Lazy-load an in-process AVSpeechSynthesizer. Returns None without pyobjc."""
+    global _avf, _synth, _voice
+    if _avf is None:
+        try:
+            import AVFoundation
+        except ImportError:
+            _avf = False
+            return None
+        _avf = AVFoundation
+        _synth = AVFoundation.AVSpeechSynthesizer.alloc().init()
+        _voice = (AVFoundation.AVSpeechSynthesisVoice.voiceWithIdentifier_(SAY_VOICE)
+                  or AVFoundation.AVSpeechSynthesisVoice.voiceWithLanguage_("en-US"))
+    return _synth
+
+
+def say(text, drop_if_busy=False):
+    """Speak text in-process via AVSpeechSynthesizer, else fork the `say` command.
+
+    Speech never overlaps: with drop_if_busy (yells) the text is skipped
+    while earlier speech is still playing, otherwise (calibration prompts)
+    the current speech is cut off so the new text is always heard.
+    """
+    global _say_proc
+    synth = _init_speech()
+    if synth is None:
+        if _say_proc is not None and _say_proc.poll() is None:
+            if drop_if_busy:
+                return
+            _say_proc.terminate()
+        _say_proc = subprocess.Popen(["say", "-v", "Samantha", "-r", "210", text])
+        return
+    if synth.isSpeaking():
+        if drop_if_busy:
+            return
+        synth.stopSpeakingAtBoundary_(_avf.AVSpeechBoundaryImmediate)
+    utterance = _avf.AVSpeechUtterance.speechUtteranceWithString_(text)
+    utterance.setVoice_(_voice)
+    utterance.setRate_(SAY_RATE)
+    synth.speakUtterance_(utterance)
+
+
+class CaptureThread(threading.Thread):
+    """Grabs camera frames continuously, decoding one only when asked.
+
+    The thread keeps calling cap.grab() so the driver queue never holds a
+    backlog of stale frames. latest() raises a request flag and the next
+    grab is retrieve()d (decoded) into a single slot, so a frame is
+    decoded once per check instead of at camera rate. Only this thread
+    touches cap.
+    """
+
+    def __init__(self, cap):
+        super().__init__(daemon=True)
+        self.cap = cap
+        self._cond = threading.Condition()
+        self._frame = None
+        self._wanted = threading.Event()
+        self._halt = threading.Event()
+
+    def run(self):
+        while not self._halt.is_set():
+            if not self.cap.grab():
+                self._halt.wait(0.5)
+                continue
+            if not self._wanted.is_set():
+                continue
+            ret, frame = self.cap.retrieve()
+            if ret:
+                with self._cond:
+                    self._frame = frame
+                    self._wanted.clear()
+                    self._cond.notify()
+
+    def latest(self, timeout=1.0):
+        """Decode the next grabbed frame, waiting up to timeout. None if none arrived."""
+        with self._cond:
+            self._frame = None  # drop one parked after an earlier call timed out
+            self._wanted.set()
+            self._cond.wait_for(lambda: self._frame is not None, timeout)
+            frame, self._frame = self._frame, None
+            self._wanted.clear()
+        return frame
+
+    def stop(self):
+        self._halt.set()
+        self.join()
+
+
+# --- OpenCV (lazy import — only needed once the camera is used) ---
+cv2 = None
+
+
+def _init_cv2():
+    """Lazy-load OpenCV on first camera use so the menu bar icon appears sooner."""
+    global cv2
+    if cv2 is None:
+        import cv2 as _cv2
+        cv2 = _cv2
+    return cv2
+
+
+def _frame_buffers():
+    """Preallocated buffers at INFER_SIZE, reused every frame.
+
+    Returns (small, rgb, rgb_in): the resized BGR frame, the RGB buffer to
+    write into, and a read-only view of it for MediaPipe. A read-only
+    array is wrapped by reference instead of copied into the graph, and
+    process() is synchronous, so rgb can be overwritten on the next frame.
+    """
+    w, h = INFER_SIZE
+    rgb = np.empty((h, w, 3), np.uint8)
+    rgb_in = rgb.view()
+    rgb_in.flags.writeable = False
+    return np.empty((h, w, 3), np.uint8), rgb, rgb_in
+
+
+class PostureLog:
+    """CSV posture log written by its own thread, in batches.
+
+    write() only enqueues, so file I/O (and any disk stall) never blocks
+    the monitor loop; if the queue is full the reading is dropped. The
+    writer thread hands readings flush_rows at a time to a DayLog, which
+    appends them through one open handle and keeps today's totals in a
+    JSON sidecar (summary_path); at midnight the finished day is kept as
+    summary_YYYY-MM-DD.json next to it. A batch that fails with an
+    OSError is dropped and the writer carries on.
+    """
+
+    def __init__(self, path=LOG_FILE, flush_rows=LOG_FLUSH_ROWS, summary_path=SUMMARY_FILE):
+        self.path = path
+        self.flush_rows = flush_rows
+        self.summary_path = summary_path
+        self._q = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, score, issue_mask):
+        """Queue a timestamped reading (issues as an IDX_* bitmask)."""
+        try:
+            self._q.put_nowait((datetime.now().isoformat(), score, issue_mask))
+        except queue.Full:
+            pass  # logging is best-effort; never stall scoring on it
+
+    def flush(self, timeout=2.0):
+        """Block until everything written so far is on disk (or timeout).
+
+        Returns False if the writer didn't get there in time, e.g. because
+        the queue stayed full.
+        """
+        done = threading.Event()
+        try:
+            self._q.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout=2.0):
+        try:
+            self._q.put(None, timeout=timeout)
+        except queue.Full:
+            return  # writer is stuck; it's a daemon thread, so just leave it
+        self._thread.join(timeout=timeout)
+
+    def _run(self):
+        log = DayLog(self.path, self.summary_path)
+        rows = []
+        while True:
+            item = self._q.get()
+            if isinstance(item, tuple):
+                rows.append(item)
+                if len(rows) < self.flush_rows:
+                    continue
+            if rows:
+                try:
+                    log.append(rows)
+                except OSError:
+                    pass  # best-effort like write(): the batch is dropped, the thread carries on
+                rows.clear()
+            if item is None:  # close()
+                log.close()
+                return
+            if isinstance(item, threading.Event):  # flush()
+                item.set()
 
 
 def get_session_summary():
@@ -55,30 +237,15 @@ def get_session_summary():
     if not os.path.exists(LOG_FILE):
         return "No session data yet"
 
-    today = datetime.now().strftime("%Y-%m-%d")
-    scores = []
-    issue_counts = {}
-
-    with open(LOG_FILE, newline='') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if not row["timestamp"].startswith(today):
-                continue
-            try:
-                scores.append(int(row["score"]))
-            except (ValueError, KeyError):
-                continue
-            if row.get("issues"):
-                for issue in row["issues"].split("; "):
-                    label = issue.split("—")[0].strip() if "—" in issue else issue
-                    issue_counts[label] = issue_counts.get(label, 0) + 1
-
-    if not scores:
+    stats = load_day_stats(datetime.now().strftime("%Y-%m-%d"))
+    count = stats['count']
+    if not count:
         return "No data today"
 
-    avg = int(np.mean(scores))
-    good_pct = int(sum(1 for s in scores if s > 80) / len(scores) * 100)
-    top_issue = max(issue_counts, key=issue_counts.get) if issue_counts else "None"
+    avg = stats['sum_score'] // count
+    good_pct = stats['good_count'] * 100 // count
+    issue_counts = stats['issue_counts']
+    top_issue = issue_counts.most_common(1)[0][0] if issue_counts else "None"
     return f"Avg: {avg}% | Good: {good_pct}% of time | Top issue: {top_issue}"
 
 
@@ -96,15 +263,28 @@ class PostureGuardApp(rumps.App):
         self.score = 100
         self.bad_posture_start = None
         self.last_yell_time = 0
-        self.score_history = []
-        self.last_issues = []
+        self.score_history = ScoreHistory(max_len=20)
+        self.last_issue_mask = 0  # IDX_* bits from the latest check
         self.monitor_thread = None
         self.stop_event = threading.Event()
         self.camera_proc = None
         self.script_dir = os.path.dirname(os.path.abspath(__file__))
         self.current_sensitivity = 'medium'
+        # Resolved once per sensitivity change, not per check
+        self._thresholds = resolve_thresholds(SENSITIVITY_PRESETS['medium'])
+        self._update_scorer()
         self._log_counter = 0
+        self._log = PostureLog()
         self._pending_ui = {}  # thread-safe UI updates
+        self._face_stride = 5  # run face mesh every Nth check while posture is fine
+        self._last_face_lm = None
+        # MediaPipe detectors, built on first use and shared by calibration
+        # and monitoring; the lock keeps the two from running them at once.
+        self._detectors = None
+        self._detector_lock = threading.Lock()
+        # Set by quit_app; calibration and monitoring then stop and whichever
+        # thread still holds the detectors closes them on its way out.
+        self._quitting = threading.Event()
 
         # Menu items
         self.status_item = rumps.MenuItem("Status: Idle", callback=None)
@@ -140,13 +320,25 @@ class PostureGuardApp(rumps.App):
             self.quit_item,
         ]
 
+        self._ui_timer = rumps.Timer(self._flush_ui, UI_FLUSH_INTERVAL)
+        self._ui_timer.start()
+
         # Auto-start if calibrated
         if self.baseline:
             self.start_monitoring()
 
-    @rumps.timer(0.5)
-    def _flush_ui(self, _):
-        """Apply pending UI updates on the main thread."""
+    def _flush_ui(self, timer):
+        """Apply pending UI updates on the main thread.
+
+        Ticks every UI_FLUSH_INTERVAL while monitoring and UI_IDLE_INTERVAL
+        otherwise. The timer retunes itself here, on the main thread,
+        because start_monitoring() can also run on the calibration thread.
+        """
+        interval = UI_FLUSH_INTERVAL if self.monitoring else UI_IDLE_INTERVAL
+        if timer.interval != interval:
+            timer.stop()
+            timer.interval = interval
+            timer.start()
         pending = self._pending_ui
         if not pending:
             return
@@ -160,11 +352,47 @@ class PostureGuardApp(rumps.App):
         if 'camera_label' in pending:
             self.camera_item.title = pending['camera_label']
 
-    def _get_thresholds(self):
-        return SENSITIVITY_PRESETS[self.current_sensitivity]
+    def _get_detectors(self):
+        """(pose, face) detectors, created on first call. Hold _detector_lock."""
+        if self._detectors is None:
+            _mp_pose, _mp_face = _init_mediapipe()
+            pose_detector = _mp_pose.Pose(
+                static_image_mode=False,
+                model_complexity=POSE_MODEL_COMPLEXITY,
+                smooth_landmarks=False,  # the score is already smoothed by score_history
+                min_detection_confidence=0.6,
+                min_tracking_confidence=0.6,
+            )
+            face_detector = _mp_face.FaceMesh(
+                static_image_mode=False,
+                max_num_faces=1,
+                refine_landmarks=False,  # iris points are never read
+                min_detection_confidence=0.6,
+                min_tracking_confidence=0.6,
+            )
+            self._detectors = (pose_detector, face_detector)
+        return self._detectors
+
+    def _close_detectors(self, blocking=True):
+        """Close the detectors; without blocking, skip it if another thread holds them."""
+        if not self._detector_lock.acquire(blocking=blocking):
+            return
+        try:
+            if self._detectors is not None:
+                for detector in self._detectors:
+                    detector.close()
+                self._detectors = None
+        finally:
+            self._detector_lock.release()
+
+    def _update_scorer(self):
+        """Rebind the per-check scorer to the current baseline and thresholds."""
+        self._scorer = make_scorer(self.baseline, self._thresholds) if self.baseline else None
 
     def _set_sensitivity(self, level, label):
         self.current_sensitivity = level
+        self._thresholds = resolve_thresholds(SENSITIVITY_PRESETS[level])
+        self._update_scorer()
         self.sens_low.state = (level == 'low')
         self.sens_med.state = (level == 'medium')
         self.sens_high.state = (level == 'high')
@@ -180,6 +408,7 @@ class PostureGuardApp(rumps.App):
         self._set_sensitivity('high', "High (strict)")
 
     def show_summary(self, _):
+        self._log.flush()
         summary = get_session_summary()
         rumps.notification("PostureGuard — Today", "", summary)
 
@@ -224,6 +453,8 @@ class PostureGuardApp(rumps.App):
             self.start_monitoring()
 
     def start_monitoring(self):
+        if self._quitting.is_set():
+            return
         self.monitoring = True
         self.stop_event.clear()
         self.toggle_item.title = "Stop Monitoring"
@@ -244,171 +475,212 @@ class PostureGuardApp(rumps.App):
     def calibrate(self, _):
         """Run calibration in background thread."""
         if self.monitoring:
+            # No wait needed: _do_calibrate blocks on _detector_lock until
+            # the monitor thread has let go of the detectors.
             self.stop_monitoring()
-            time.sleep(1)
 
         rumps.notification("PostureGuard", "Calibrating...", "Sit up straight! Capturing your good posture for 3 seconds...")
         say("Sit up straight. Calibrating in 3 seconds.")
 
         def _do_calibrate():
             time.sleep(2)  # give user time to sit up
-            _mp_pose, _mp_face = _init_mediapipe()
-
-            pose_detector = _mp_pose.Pose(
-                static_image_mode=False,
-                model_complexity=1,
-                smooth_landmarks=True,
-                min_detection_confidence=0.6,
-                min_tracking_confidence=0.6,
-            )
-            face_detector = _mp_face.FaceMesh(
-                static_image_mode=False,
-                max_num_faces=1,
-                refine_landmarks=True,
-                min_detection_confidence=0.6,
-                min_tracking_confidence=0.6,
-            )
-
-            cap = cv2.VideoCapture(CAMERA_INDEX)
-            if not cap.isOpened():
+            if self._quitting.is_set():
+                return
+            with self._detector_lock:
+                frames = self._calibration_frames()
+            if self._quitting.is_set():
+                self._close_detectors()  # quit_app couldn't while we held them
+                return
+            if frames is None:
                 rumps.notification("PostureGuard", "Error", "Cannot access camera!")
                 return
 
-            try:
-                frames = []
-                for _ in range(45):  # ~3 seconds at ~15fps effective
-                    ret, frame = cap.read()
-                    if not ret:
-                        continue
-                    frame = cv2.flip(frame, 1)
-                    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-                    pose_r = pose_detector.process(rgb)
-                    face_r = face_detector.process(rgb)
-
-                    if pose_r.pose_landmarks:
-                        face_lm = None
-                        if face_r.multi_face_landmarks:
-                            face_lm = face_r.multi_face_landmarks[0].landmark
-                        m = extract_metrics(pose_r.pose_landmarks.landmark, face_lm)
-                        if m:
-                            frames.append(m)
-                    time.sleep(0.066)
-            finally:
-                cap.release()
-                pose_detector.close()
-                face_detector.close()
-
             if len(frames) < 10:
                 rumps.notification("PostureGuard", "Error", "Couldn't detect your pose. Make sure camera can see your face and shoulders.")
                 say("Calibration failed. I can't see you properly.")
                 return
 
             self.baseline = average_metrics(frames)
+            self._update_scorer()
             save_calibration(self.baseline)
 
             say("Calibration complete. I'm watching you.")
             rumps.notification("PostureGuard", "Calibrated!", f"Captured {len(frames)} frames. Now monitoring.")
-            self.score_history = []
+            self.score_history.clear()
             self.start_monitoring()
 
         threading.Thread(target=_do_calibrate, daemon=True).start()
 
+    def _calibration_frames(self):
+        """Metrics from ~3 s of camera frames, or None if the camera won't open.
+
+        Capture and inference overlap: this thread reads and downsizes
+        frames on the calibration cadence while a single worker runs them
+        through the shared detectors in order (they track across frames and
+        are not reentrant). Caller holds _detector_lock.
+        """
+        _init_cv2()
+        pose_detector, face_detector = self._get_detectors()
+        cap = open_camera(CAMERA_INDEX, fps=APP_CAMERA_FPS)
+        if cap is None:
+            return None
+
+        _, rgb, rgb_in = _frame_buffers()  # only touched by the single worker
+
+        def process_one(small):
+            np.copyto(rgb, small[:, ::-1, ::-1])  # mirror + BGR->RGB
+            pose_r = pose_detector.process(rgb_in)
+            if not pose_r.pose_landmarks:
+                return None
+            face_r = face_detector.process(rgb_in)
+            face_lm = face_r.multi_face_landmarks[0].landmark if face_r.multi_face_landmarks else None
+            return extract_metrics(pose_r.pose_landmarks.landmark, face_lm)
+
+        try:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                pending = []
+                for _ in range(45):  # ~3 seconds at ~15fps effective
+                    ret, frame = cap.read()
+                    if not ret:
+                        continue
+                    small = cv2.resize(frame, INFER_SIZE, interpolation=cv2.INTER_AREA)
+                    pending.append(pool.submit(process_one, small))
+                    time.sleep(0.066)
+                results = [f.result() for f in pending]
+        finally:
+            cap.release()
+        return [m for m in results if m]
+
     def _monitor_loop(self):
         """Background loop: grab frame, check posture, update menu bar."""
-        _mp_pose, _mp_face = _init_mediapipe()
-        pose_detector = _mp_pose.Pose(
-            static_image_mode=False,
-            model_complexity=1,
-            smooth_landmarks=True,
-            min_detection_confidence=0.6,
-            min_tracking_confidence=0.6,
-        )
-        face_detector = _mp_face.FaceMesh(
-            static_image_mode=False,
-            max_num_faces=1,
-            refine_landmarks=True,
-            min_detection_confidence=0.6,
-            min_tracking_confidence=0.6,
-        )
-
-        cap = cv2.VideoCapture(CAMERA_INDEX)
-        if not cap.isOpened():
+        with self._detector_lock:
+            self._run_monitor()
+        if self._quitting.is_set():
+            self._close_detectors()  # quit_app couldn't while we held them
+
+    def _run_monitor(self):
+        _init_cv2()
+        pose_detector, face_detector = self._get_detectors()
+        cap = open_camera(CAMERA_INDEX, fps=APP_CAMERA_FPS)
+        if cap is None:
             rumps.notification("PostureGuard", "Error", "Cannot access camera!")
             self.monitoring = False
             return
 
+        capture = CaptureThread(cap)
+        capture.start()
+        frame_idx = 0
+        self._last_face_lm = None
+        small, rgb, rgb_in = _frame_buffers()
+        # Motion-gate thumbnails: the current frame and the last inferred one
+        mw, mh = MOTION_SIZE
+        thumb = np.empty((mh, mw, 3), np.uint8)
+        gray = np.empty((mh, mw), np.uint8)
+        ref_gray = np.empty_like(gray)
+        metrics = None
+        face_pool = ThreadPoolExecutor(max_workers=1)
         try:
             while not self.stop_event.is_set():
-                ret, frame = cap.read()
-                if not ret:
-                    time.sleep(0.5)
+                frame = capture.latest()
+                if frame is None:
                     continue
 
-                frame = cv2.flip(frame, 1)
-                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-                pose_r = pose_detector.process(rgb)
-                face_r = face_detector.process(rgb)
-
-                if pose_r.pose_landmarks:
-                    face_lm = None
-                    if face_r.multi_face_landmarks:
-                        face_lm = face_r.multi_face_landmarks[0].landmark
-
-                    metrics = extract_metrics(pose_r.pose_landmarks.landmark, face_lm)
-
-                    if metrics and self.baseline:
-                        thresholds = self._get_thresholds()
-                        issues, score = compare_to_baseline(metrics, self.baseline, thresholds)
-                        smoothed = smooth_score(self.score_history, score)
-
-                        self.score = smoothed
-                        self.last_issues = issues
-
-                        # Log every 6th reading (~3 seconds) to avoid huge files
-                        self._log_counter += 1
-                        if self._log_counter % 6 == 0:
-                            log_posture(smoothed, issues)
-
-                        # Queue UI updates for the main thread
-                        if smoothed > 80:
-                            ui_title = "PG"
-                        elif smoothed > 50:
-                            ui_title = "PG!"
-                        else:
-                            ui_title = "PG!!"
-
-                        ui_issues = issues[0][0].split("—")[0].strip() if issues else "Looking good!"
-                        self._pending_ui = {
-                            'title': ui_title,
-                            'score': f"Score: {smoothed}%",
-                            'issues': ui_issues,
-                        }
-
-                        # Yell logic
-                        now = time.time()
-                        if issues:
-                            if self.bad_posture_start is None:
-                                self.bad_posture_start = now
-                            elif (now - self.bad_posture_start > BAD_POSTURE_SECONDS
-                                  and now - self.last_yell_time > COOLDOWN_SECONDS):
-                                msg = issues[0][0]
-                                yell = msg.split("—")[1].strip().rstrip("!") + "!" if "—" in msg else "Fix your posture!"
-                                say(f"Hey! {yell}")
-                                rumps.notification("PostureGuard", f"Score: {smoothed}%", msg)
-                                self.last_yell_time = now
-                        else:
-                            self.bad_posture_start = None
-
-                time.sleep(CHECK_INTERVAL)
+                # Landmarks are normalized, so a smaller input leaves metrics unchanged
+                cv2.resize(frame, INFER_SIZE, dst=small, interpolation=cv2.INTER_AREA)
+
+                # Motion gate: if the scene barely changed since the last
+                # inference, re-score the cached metrics instead of running
+                # MediaPipe. Comparing against the last inferred frame (not
+                # the previous one) lets slow drift add up and re-trigger.
+                cv2.resize(small, MOTION_SIZE, dst=thumb, interpolation=cv2.INTER_AREA)
+                cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY, dst=gray)
+                if metrics is None or frame_motion(ref_gray, gray) >= MOTION_THRESHOLD:
+                    gray, ref_gray = ref_gray, gray  # this frame becomes the reference
+                    # Mirror and BGR->RGB as one reversed view, copied into the
+                    # C-contiguous buffer MediaPipe needs. The mirror is free:
+                    # the RGB copy happens anyway, and the fully reversed view
+                    # copies faster than a channel-only one. It also keeps
+                    # metrics in the same orientation as saved calibrations.
+                    np.copyto(rgb, small[:, ::-1, ::-1])
+
+                    # Face mesh only feeds the forward-lean ratio, which drifts
+                    # slowly: refresh it every _face_stride checks, or every
+                    # check while pose already shows a problem. If someone was
+                    # in frame last check, it runs on face_pool alongside pose
+                    # (MediaPipe releases the GIL while its graph runs).
+                    face_due = frame_idx % self._face_stride == 0 or self.last_issue_mask
+                    face_job = (face_pool.submit(face_detector.process, rgb_in)
+                                if face_due and metrics is not None else None)
+                    pose_r = pose_detector.process(rgb_in)
+                    face_r = face_job.result() if face_job else None  # before rgb is reused
+                    metrics = None
+                    if pose_r.pose_landmarks:
+                        if face_due:
+                            if face_r is None:
+                                face_r = face_detector.process(rgb_in)
+                            self._last_face_lm = (face_r.multi_face_landmarks[0].landmark
+                                                  if face_r.multi_face_landmarks else None)
+                        frame_idx += 1
+
+                        metrics = extract_metrics_array(pose_r.pose_landmarks.landmark, self._last_face_lm)
+
+                scorer = self._scorer
+                if metrics is not None and scorer is not None:
+                    issue_mask, _, score = scorer(metrics)
+                    smoothed = self.score_history.push(score)
+
+                    self.score = smoothed
+                    self.last_issue_mask = issue_mask
+                    top = first_issue(issue_mask)
+
+                    # Log every 6th reading (~3 seconds) to avoid huge files
+                    self._log_counter += 1
+                    if self._log_counter % 6 == 0:
+                        self._log.write(smoothed, issue_mask)
+
+                    # Queue UI updates for the main thread
+                    if smoothed > 80:
+                        ui_title = "PG"
+                    elif smoothed > 50:
+                        ui_title = "PG!"
+                    else:
+                        ui_title = "PG!!"
+
+                    ui_issues = ISSUES[top][0] if issue_mask else "Looking good!"
+                    self._pending_ui = {
+                        'title': ui_title,
+                        'score': f"Score: {smoothed}%",
+                        'issues': ui_issues,
+                    }
+
+                    # Yell logic
+                    now = time.time()
+                    if issue_mask:
+                        if self.bad_posture_start is None:
+                            self.bad_posture_start = now
+                        elif (now - self.bad_posture_start > BAD_POSTURE_SECONDS
+                              and now - self.last_yell_time > COOLDOWN_SECONDS):
+                            say(f"Hey! {ISSUES[top][1]}!", drop_if_busy=True)
+                            rumps.notification("PostureGuard", f"Score: {smoothed}%", ISSUE_MESSAGES[top])
+                            self.last_yell_time = now
+                    else:
+                        self.bad_posture_start = None
+
+                self.stop_event.wait(CHECK_INTERVAL)  # returns early on stop
         finally:
+            face_pool.shutdown()
+            capture.stop()
             cap.release()
-            pose_detector.close()
-            face_detector.close()
+            self._log.flush()
 
     def quit_app(self, _):
+        self._quitting.set()
         self.stop_monitoring()
+        if self.monitor_thread is not None:
+            self.monitor_thread.join(timeout=3)
+        # Never wait on a running calibration here; that would freeze the menu bar
+        self._close_detectors(blocking=False)
+        self._log.close()
         if self.camera_proc and self.camera_proc.poll() is None:
             self.camera_proc.terminate()
         rumps.quit_application()
@@ -5,17 +5,26 @@ import json
 import os
 import tempfile
 import unittest
+from types import SimpleNamespace
 from unittest.mock import patch
 
+import numpy as np
+
+import posture_core
 from posture_core import (
     SENSITIVITY_PRESETS,
     THRESH_HEAD_DROP, THRESH_SLOUCH, THRESH_HEAD_FORWARD, THRESH_SHOULDER_TILT,
     WEIGHT_HEAD_DROP, WEIGHT_SLOUCH, WEIGHT_LEAN, WEIGHT_SHOULDER, WEIGHT_FORWARD,
+    MIN_VISIBILITY, MOTION_THRESHOLD,
+    Metrics,
+    extract_metrics,
     compare_to_baseline,
     load_calibration,
     save_calibration,
     average_metrics,
     smooth_score,
+    ScoreHistory,
+    frame_motion,
 )
 
 
@@ -23,28 +32,74 @@ from posture_core import (
 
 def make_baseline():
     """A representative calibrated baseline."""
-    return {
-        "nose_to_shoulder_y": -0.25,
-        "nose_to_shoulder_x": 0.0,
-        "ear_shoulder_dist": 0.18,
-        "shoulder_tilt": 0.0,
-        "nose_to_ear_y": -0.05,
-        "face_tilt": 0.0,
-        "face_forward_ratio": 0.12,
-        "nose_y": 0.35,
-        "mid_ear_y": 0.40,
-        "mid_shoulder_y": 0.60,
-    }
+    return Metrics(
+        nose_to_shoulder_y=-0.25,
+        nose_to_shoulder_x=0.0,
+        ear_shoulder_dist=0.18,
+        shoulder_tilt=0.0,
+        nose_to_ear_y=-0.05,
+        face_tilt=0.0,
+        face_forward_ratio=0.12,
+        nose_y=0.35,
+        mid_ear_y=0.40,
+        mid_shoulder_y=0.60,
+    )
 
 
 def make_current(overrides=None):
     """Current metrics identical to baseline (perfect posture), with optional overrides."""
     m = make_baseline()
     if overrides:
-        m.update(overrides)
+        m = m._replace(**overrides)
     return m
 
 
+def make_pose_landmarks(visibility=1.0):
+    """33 fake pose landmarks with nose, ears and shoulders placed sensibly."""
+    lm = [SimpleNamespace(x=0.5, y=0.5, visibility=0.0) for _ in range(33)]
+    lm[0] = SimpleNamespace(x=0.50, y=0.35, visibility=visibility)   # nose
+    lm[7] = SimpleNamespace(x=0.55, y=0.38, visibility=visibility)   # left ear
+    lm[8] = SimpleNamespace(x=0.45, y=0.42, visibility=visibility)   # right ear
+    lm[11] = SimpleNamespace(x=0.65, y=0.58, visibility=visibility)  # left shoulder
+    lm[12] = SimpleNamespace(x=0.35, y=0.62, visibility=visibility)  # right shoulder
+    return lm
+
+
+class TestExtractMetrics(unittest.TestCase):
+    """Tests for extract_metrics() with fake landmarks (no MediaPipe needed)."""
+
+    def test_pose_metrics(self):
+        m = extract_metrics(make_pose_landmarks())
+        self.assertAlmostEqual(m.mid_shoulder_y, 0.60)
+        self.assertAlmostEqual(m.mid_ear_y, 0.40)
+        self.assertAlmostEqual(m.nose_to_shoulder_y, -0.25)
+        self.assertAlmostEqual(m.nose_to_shoulder_x, 0.0)
+        self.assertAlmostEqual(m.ear_shoulder_dist, 0.20)
+        self.assertAlmostEqual(m.shoulder_tilt, -0.04)
+        self.assertEqual(m.face_forward_ratio, 0.0)
+
+    def test_low_visibility_returns_none(self):
+        self.assertIsNone(extract_metrics(make_pose_landmarks(visibility=MIN_VISIBILITY / 2)))
+
+    def test_face_metrics(self):
+        face = [SimpleNamespace(x=0.5, y=0.5) for _ in range(468)]
+        face[10] = SimpleNamespace(x=0.52, y=0.2)
+        face[152] = SimpleNamespace(x=0.50, y=0.5)
+        face[234] = SimpleNamespace(x=0.40, y=0.35)
+        face[454] = SimpleNamespace(x=0.60, y=0.35)
+        m = extract_metrics(make_pose_landmarks(), face)
+        self.assertAlmostEqual(m.face_tilt, 0.02)
+        self.assertAlmostEqual(m.face_forward_ratio, 0.20)
+
+    def test_pure_python_kernel_matches(self):
+        expected = extract_metrics(make_pose_landmarks())
+        with patch('posture_core._compiled_metrics_kernel', posture_core._metrics_kernel):
+            m = extract_metrics(make_pose_landmarks())
+            self.assertIsNone(extract_metrics(make_pose_landmarks(visibility=MIN_VISIBILITY / 2)))
+        for got, want in zip(m, expected):
+            self.assertAlmostEqual(got, want)
+
+
 class TestCompareToBaseline(unittest.TestCase):
     """Unit tests for compare_to_baseline()."""
 
@@ -58,7 +113,7 @@ class TestCompareToBaseline(unittest.TestCase):
     def test_head_drop_detected(self):
         baseline = make_baseline()
         # Simulate head dropping: nose_to_shoulder_y increases
-        current = make_current({"nose_to_shoulder_y": baseline["nose_to_shoulder_y"] + 0.08})
+        current = make_current({"nose_to_shoulder_y": baseline.nose_to_shoulder_y + 0.08})
         issues, score = compare_to_baseline(current, baseline)
         labels = [msg for msg, _ in issues]
         self.assertTrue(any("Head dropping" in l for l in labels))
@@ -67,7 +122,7 @@ class TestCompareToBaseline(unittest.TestCase):
     def test_slouch_detected(self):
         baseline = make_baseline()
         # Simulate slouching: ear_shoulder_dist decreases
-        current = make_current({"ear_shoulder_dist": baseline["ear_shoulder_dist"] - 0.10})
+        current = make_current({"ear_shoulder_dist": baseline.ear_shoulder_dist - 0.10})
         issues, score = compare_to_baseline(current, baseline)
         labels = [msg for msg, _ in issues]
         self.assertTrue(any("Slouching" in l for l in labels))
@@ -76,14 +131,14 @@ class TestCompareToBaseline(unittest.TestCase):
     def test_lateral_lean_detected(self):
         baseline = make_baseline()
         # Simulate leaning right: nose_to_shoulder_x increases
-        current = make_current({"nose_to_shoulder_x": baseline["nose_to_shoulder_x"] + 0.06})
+        current = make_current({"nose_to_shoulder_x": baseline.nose_to_shoulder_x + 0.06})
         issues, score = compare_to_baseline(current, baseline)
         labels = [msg for msg, _ in issues]
         self.assertTrue(any("Leaning right" in l for l in labels))
 
     def test_lateral_lean_left_detected(self):
         baseline = make_baseline()
-        current = make_current({"nose_to_shoulder_x": baseline["nose_to_shoulder_x"] - 0.06})
+        current = make_current({"nose_to_shoulder_x": baseline.nose_to_shoulder_x - 0.06})
         issues, score = compare_to_baseline(current, baseline)
         labels = [msg for msg, _ in issues]
         self.assertTrue(any("Leaning left" in l for l in labels))
@@ -99,14 +154,14 @@ class TestCompareToBaseline(unittest.TestCase):
     def test_forward_lean_detected(self):
         baseline = make_baseline()
         # Simulate leaning forward: face_forward_ratio increases significantly
-        current = make_current({"face_forward_ratio": baseline["face_forward_ratio"] + 0.05})
+        current = make_current({"face_forward_ratio": baseline.face_forward_ratio + 0.05})
         issues, score = compare_to_baseline(current, baseline)
         labels = [msg for msg, _ in issues]
         self.assertTrue(any("Leaning forward" in l for l in labels))
 
     def test_forward_lean_ignored_without_baseline_face(self):
         baseline = make_baseline()
-        baseline["face_forward_ratio"] = 0  # no face data in calibration
+        baseline = baseline._replace(face_forward_ratio=0)  # no face data in calibration
         current = make_current({"face_forward_ratio": 0.20})
         issues, score = compare_to_baseline(current, baseline)
         labels = [msg for msg, _ in issues]
@@ -116,11 +171,11 @@ class TestCompareToBaseline(unittest.TestCase):
         baseline = make_baseline()
         # Everything terrible at once
         current = make_current({
-            "nose_to_shoulder_y": baseline["nose_to_shoulder_y"] + 0.30,
-            "ear_shoulder_dist": baseline["ear_shoulder_dist"] - 0.30,
+            "nose_to_shoulder_y": baseline.nose_to_shoulder_y + 0.30,
+            "ear_shoulder_dist": baseline.ear_shoulder_dist - 0.30,
             "nose_to_shoulder_x": 0.30,
             "shoulder_tilt": 0.20,
-            "face_forward_ratio": baseline["face_forward_ratio"] + 0.20,
+            "face_forward_ratio": baseline.face_forward_ratio + 0.20,
         })
         issues, score = compare_to_baseline(current, baseline)
         self.assertGreaterEqual(score, 0)
@@ -129,7 +184,7 @@ class TestCompareToBaseline(unittest.TestCase):
         baseline = make_baseline()
         # This deviation is below default threshold but above a very strict one
         small_drop = THRESH_HEAD_DROP * 0.5
-        current = make_current({"nose_to_shoulder_y": baseline["nose_to_shoulder_y"] + small_drop})
+        current = make_current({"nose_to_shoulder_y": baseline.nose_to_shoulder_y + small_drop})
 
         # Default: no issue
         issues, _ = compare_to_baseline(current, baseline)
@@ -149,7 +204,7 @@ class TestCompareToBaseline(unittest.TestCase):
     def test_low_sensitivity_is_more_permissive(self):
         baseline = make_baseline()
         drop = 0.05  # triggers on medium but not on low
-        current = make_current({"nose_to_shoulder_y": baseline["nose_to_shoulder_y"] + drop})
+        current = make_current({"nose_to_shoulder_y": baseline.nose_to_shoulder_y + drop})
 
         issues_med, score_med = compare_to_baseline(current, baseline, SENSITIVITY_PRESETS['medium'])
         issues_low, score_low = compare_to_baseline(current, baseline, SENSITIVITY_PRESETS['low'])
@@ -158,19 +213,19 @@ class TestCompareToBaseline(unittest.TestCase):
     def test_multiple_issues_compound_penalty(self):
         baseline = make_baseline()
         current = make_current({
-            "nose_to_shoulder_y": baseline["nose_to_shoulder_y"] + 0.08,
-            "ear_shoulder_dist": baseline["ear_shoulder_dist"] - 0.10,
+            "nose_to_shoulder_y": baseline.nose_to_shoulder_y + 0.08,
+            "ear_shoulder_dist": baseline.ear_shoulder_dist - 0.10,
         })
         issues, score = compare_to_baseline(current, baseline)
         self.assertGreater(len(issues), 1)
         # Score should be lower than single-issue case
-        single = make_current({"nose_to_shoulder_y": baseline["nose_to_shoulder_y"] + 0.08})
+        single = make_current({"nose_to_shoulder_y": baseline.nose_to_shoulder_y + 0.08})
         _, single_score = compare_to_baseline(single, baseline)
         self.assertLess(score, single_score)
 
     def test_issues_include_deviation_value(self):
         baseline = make_baseline()
-        current = make_current({"nose_to_shoulder_y": baseline["nose_to_shoulder_y"] + 0.08})
+        current = make_current({"nose_to_shoulder_y": baseline.nose_to_shoulder_y + 0.08})
         issues, _ = compare_to_baseline(current, baseline)
         self.assertGreater(len(issues), 0)
         msg, val = issues[0]
@@ -178,6 +233,99 @@ class TestCompareToBaseline(unittest.TestCase):
         self.assertGreater(val, 0)
 
 
+class TestScoreKernel(unittest.TestCase):
+    """Tests for the numeric scoring kernel behind compare_to_baseline()."""
+
+    def test_issue_messages_from_table(self):
+        self.assertEqual(len(posture_core.ISSUES), len(posture_core.ISSUE_MESSAGES))
+        self.assertEqual(posture_core.ISSUE_MESSAGES[posture_core.IDX_HEAD], "Head dropping — chin up!")
+
+    def test_resolved_thresholds_match_mapping(self):
+        baseline = make_baseline()
+        current = make_current({"ear_shoulder_dist": baseline.ear_shoulder_dist - 0.04})
+        preset = SENSITIVITY_PRESETS['high']
+        resolved = posture_core.resolve_thresholds(preset)
+        self.assertEqual(posture_core.resolve_thresholds(),
+                         (THRESH_HEAD_DROP, THRESH_SLOUCH, THRESH_HEAD_FORWARD, THRESH_SHOULDER_TILT))
+        self.assertEqual(posture_core.score_posture(current, baseline, resolved),
+                         posture_core.score_posture(current, baseline, preset))
+
+    def test_make_scorer_matches_score_posture(self):
+        baseline = make_baseline()
+        current = make_current({
+            "nose_to_shoulder_y": baseline.nose_to_shoulder_y + 0.08,
+            "shoulder_tilt": 0.04,
+        })
+        preset = SENSITIVITY_PRESETS['low']
+        scorer = posture_core.make_scorer(baseline, posture_core.resolve_thresholds(preset))
+        self.assertEqual(scorer(current), posture_core.score_posture(current, baseline, preset))
+        self.assertEqual(posture_core.make_scorer(baseline)(baseline)[::2], (0, 100))
+
+    def test_score_posture_mask(self):
+        baseline = make_baseline()
+        current = make_current({
+            "nose_to_shoulder_y": baseline.nose_to_shoulder_y + 0.08,
+            "nose_to_shoulder_x": -0.06,
+        })
+        mask, _, score = posture_core.score_posture(current, baseline)
+        self.assertEqual(mask, 1 << posture_core.IDX_HEAD | 1 << posture_core.IDX_LEAN_LEFT)
+        self.assertEqual(posture_core.first_issue(mask), posture_core.IDX_HEAD)
+        self.assertEqual(posture_core.first_issue(0), -1)
+        self.assertEqual(score, compare_to_baseline(current, baseline)[1])
+
+    def test_metric_indices_match_fields(self):
+        for i, name in enumerate(Metrics._fields):
+            self.assertEqual(getattr(posture_core, "I_" + name.upper()), i)
+
+    def test_accepts_metric_arrays(self):
+        baseline = make_baseline()
+        current = make_current({"ear_shoulder_dist": baseline.ear_shoulder_dist - 0.10})
+        expected = compare_to_baseline(current, baseline)
+        got = compare_to_baseline(posture_core.metrics_array(current), posture_core.metrics_array(baseline))
+        self.assertEqual(got, expected)
+
+    def test_pure_python_kernel_matches(self):
+        baseline = make_baseline()
+        current = make_current({
+            "nose_to_shoulder_y": baseline.nose_to_shoulder_y + 0.08,
+            "nose_to_shoulder_x": -0.06,
+            "shoulder_tilt": 0.06,
+        })
+        expected = compare_to_baseline(current, baseline)
+        with patch('posture_core._compiled_kernel', posture_core._score_kernel):
+            issues, score = compare_to_baseline(current, baseline)
+        self.assertEqual(score, expected[1])
+        self.assertEqual([m for m, _ in issues], [m for m, _ in expected[0]])
+        for (_, got), (_, want) in zip(issues, expected[0]):
+            self.assertAlmostEqual(got, want)
+
+
+class TestModelSettings(unittest.TestCase):
+    """Locks the MediaPipe settings shared by the app and preview."""
+
+    def test_lite_pose_model(self):
+        self.assertEqual(posture_core.POSE_MODEL_COMPLEXITY, 0)
+
+    def test_infer_size_keeps_camera_aspect(self):
+        w, h = posture_core.INFER_SIZE
+        self.assertEqual(w * 3, h * 4)
+
+
+class TestFrameMotion(unittest.TestCase):
+    """Tests for the motion gate's frame difference."""
+
+    def test_identical_frames(self):
+        gray = np.full((48, 64), 120, dtype=np.uint8)
+        self.assertEqual(frame_motion(gray, gray.copy()), 0.0)
+
+    def test_no_uint8_wraparound(self):
+        prev = np.full((48, 64), 10, dtype=np.uint8)
+        cur = np.full((48, 64), 5, dtype=np.uint8)
+        self.assertEqual(frame_motion(prev, cur), 5.0)
+        self.assertGreaterEqual(frame_motion(prev, np.full_like(prev, 200)),
+                                MOTION_THRESHOLD)
+
+
 class TestCalibrationIO(unittest.TestCase):
     """Tests for save/load calibration."""
 
@@ -193,29 +341,184 @@ class TestCalibrationIO(unittest.TestCase):
         finally:
             os.unlink(tmp)
 
+    def test_roundtrip_without_orjson(self):
+        baseline = make_baseline()
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+            tmp = f.name
+        try:
+            with patch('posture_core.CALIBRATION_FILE', tmp), patch('posture_core.orjson', None):
+                save_calibration(baseline)
+                loaded = load_calibration()
+            self.assertEqual(baseline, loaded)
+        finally:
+            os.unlink(tmp)
+
+    def test_saved_file_is_plain_json(self):
+        # The baseline stays a user-inspectable JSON object of metric ratios
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+            tmp = f.name
+        try:
+            with patch('posture_core.CALIBRATION_FILE', tmp):
+                save_calibration(make_baseline())
+            with open(tmp) as f:
+                data = json.load(f)
+            self.assertEqual(list(data), list(Metrics._fields))
+        finally:
+            os.unlink(tmp)
+
     def test_load_missing_file_returns_none(self):
         with patch('posture_core.CALIBRATION_FILE', '/tmp/nonexistent_postureguard_test.json'):
             self.assertIsNone(load_calibration())
 
 
+class TestDayStats(unittest.TestCase):
+    """Tests for the log tail scan and the daily summary sidecar."""
+
+    TODAY = "2026-10-15"
+    HEADER = "timestamp,score,issues"
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.log = os.path.join(self._tmp.name, "posture_log.csv")
+        self.summary = os.path.join(self._tmp.name, "summary_today.json")
+
+    def write_log(self, *lines):
+        with open(self.log, 'w') as f:
+            f.write("".join(line + "\n" for line in lines))
+
+    def rows(self, day, n, score=90):
+        return [f"{day}T10:{i:02d}:00,{score},Slouching — sit up straight!" for i in range(n)]
+
+    def test_header_only(self):
+        self.write_log(self.HEADER)
+        self.assertEqual(posture_core.tail_lines(self.log, self.TODAY), [])
+        self.assertEqual(posture_core.scan_day_stats(self.TODAY, self.log)['count'], 0)
+
+    def test_empty_and_missing_file(self):
+        self.assertEqual(posture_core.scan_day_stats(self.TODAY, self.log)['count'], 0)
+        self.write_log()
+        self.assertEqual(posture_core.tail_lines(self.log, self.TODAY), [])
+
+    def test_no_rows_today(self):
+        self.write_log(self.HEADER, *self.rows("2026-10-14", 5))
+        self.assertEqual(posture_core.tail_lines(self.log, self.TODAY), [])
+
+    def test_today_spans_blocks(self):
+        today = self.rows(self.TODAY, 12)
+        self.write_log(self.HEADER, *self.rows("2026-10-14", 8), *today)
+        for block in (1, 7, 64 * 1024):
+            self.assertEqual(posture_core.tail_lines(self.log, self.TODAY, block), today)
+
+    def test_no_header(self):
+        today = self.rows(self.TODAY, 3)
+        self.write_log(*today)
+        self.assertEqual(posture_core.tail_lines(self.log, self.TODAY, 7), today)
+        self.write_log(*self.rows("2026-10-14", 2), *today)
+        self.assertEqual(posture_core.tail_lines(self.log, self.TODAY, 7), today)
+
+    def test_scan_totals(self):
+        self.write_log(self.HEADER, *self.rows("2026-10-14", 4, 10),
+                       *self.rows(self.TODAY, 3, 90), f"{self.TODAY}T11:00:00,50,")
+        stats = posture_core.scan_day_stats(self.TODAY, self.log)
+        self.assertEqual((stats['count'], stats['sum_score'], stats['good_count']), (4, 320, 3))
+        self.assertEqual(stats['issue_counts'], {"Slouching": 3})
+
+    def test_load_prefers_current_sidecar(self):
+        self.write_log(self.HEADER, *self.rows(self.TODAY, 2))
+        sidecar = {'date': self.TODAY, 'count': 7, 'sum_score': 700, 'good_count': 7, 'issue_counts': {}}
+        posture_core.save_day_stats(self.summary, sidecar)
+        self.assertEqual(posture_core.load_day_stats(self.TODAY, self.log, self.summary)['count'], 7)
+
+    def test_malformed_sidecar_falls_back_to_log(self):
+        self.write_log(self.HEADER, *self.rows(self.TODAY, 2))
+        for bad in ([], {'date': self.TODAY}, {'date': self.TODAY, 'count': "7", 'sum_score': 0,
+                                              'good_count': 0, 'issue_counts': {}}):
+            with open(self.summary, 'w') as f:
+                json.dump(bad, f)
+            self.assertEqual(posture_core.load_day_stats(self.TODAY, self.log, self.summary)['count'], 2)
+
+    def test_rollover_archives_previous_day(self):
+        self.write_log(self.HEADER, *self.rows("2026-10-14", 2), *self.rows(self.TODAY, 1))
+        yesterday = posture_core.scan_day_stats("2026-10-14", self.log)
+        stats = posture_core.roll_day_stats(yesterday, self.TODAY, self.log, self.summary)
+        self.assertEqual((stats['date'], stats['count']), (self.TODAY, 1))
+        with open(os.path.join(self._tmp.name, "summary_2026-10-14.json")) as f:
+            self.assertEqual(json.load(f)['count'], 2)
+
+    def test_restart_archives_stale_sidecar(self):
+        self.write_log(self.HEADER, *self.rows("2026-10-14", 2))
+        posture_core.save_day_stats(self.summary, posture_core.scan_day_stats("2026-10-14", self.log))
+        stats = posture_core.roll_day_stats(None, self.TODAY, self.log, self.summary)
+        self.assertEqual((stats['date'], stats['count']), (self.TODAY, 0))
+        with open(os.path.join(self._tmp.name, "summary_2026-10-14.json")) as f:
+            self.assertEqual(json.load(f)['count'], 2)
+
+    def test_rollover_prunes_old_archives(self):
+        for day in ("2026-10-10", "2026-10-11", "2026-10-12", "2026-10-13"):
+            posture_core.save_day_stats(os.path.join(self._tmp.name, f"summary_{day}.json"), {'date': day})
+        posture_core.save_day_stats(self.summary, posture_core.scan_day_stats("2026-10-14", self.log))
+        with patch('posture_core.SUMMARY_ARCHIVE_DAYS', 2):
+            posture_core.roll_day_stats(None, self.TODAY, self.log, self.summary)
+        self.assertEqual(sorted(os.listdir(self._tmp.name)),
+                         ["summary_2026-10-13.json", "summary_2026-10-14.json", "summary_today.json"])
+
+    def readings(self, day, n, score=90):
+        return [(f"{day}T10:{i:02d}:00", score, 1 << posture_core.IDX_SLOUCH) for i in range(n)]
+
+    def read_sidecar(self, path=None):
+        with open(path or self.summary) as f:
+            return json.load(f)
+
+    def test_day_log_failed_write_not_counted(self):
+        log = posture_core.DayLog(self.log, self.summary)
+        log.append(self.readings(self.TODAY, 3))
+        os.close(log._fh.fileno())  # the next flush fails with EBADF
+        with self.assertRaises(OSError):
+            log.append(self.readings(self.TODAY, 2))
+        log.append(self.readings(self.TODAY, 1))
+        log.close()
+        with open(self.log) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines.count(self.HEADER), 1)
+        self.assertEqual(self.read_sidecar()['count'], len(lines) - 1)
+        self.assertEqual(self.read_sidecar()['issue_counts'], {posture_core.ISSUES[posture_core.IDX_SLOUCH][0]: 4})
+
+    def test_day_log_batch_across_midnight(self):
+        log = posture_core.DayLog(self.log, self.summary)
+        log.append(self.readings("2026-10-14", 2) + self.readings(self.TODAY, 3, 50))
+        log.close()
+        self.assertEqual(self.read_sidecar()['count'], 3)
+        self.assertEqual(self.read_sidecar(os.path.join(self._tmp.name, "summary_2026-10-14.json"))['count'], 2)
+        self.assertEqual(posture_core.scan_day_stats(self.TODAY, self.log)['sum_score'], 150)
+
+    def test_restart_keeps_current_sidecar(self):
+        sidecar = {'date': self.TODAY, 'count': 3, 'sum_score': 270, 'good_count': 3, 'issue_counts': {}}
+        posture_core.save_day_stats(self.summary, sidecar)
+        stats = posture_core.roll_day_stats(None, self.TODAY, self.log, self.summary)
+        self.assertEqual(stats['count'], 3)
+        self.assertEqual(os.listdir(self._tmp.name), ["summary_today.json"])
+
+
 class TestAverageMetrics(unittest.TestCase):
     """Tests for average_metrics()."""
 
     def test_single_frame(self):
         frames = [make_baseline()]
         result = average_metrics(frames)
-        for key, val in make_baseline().items():
-            self.assertAlmostEqual(result[key], val, places=6)
+        for key, val in make_baseline()._asdict().items():
+            self.assertAlmostEqual(getattr(result, key), val, places=6)
 
     def test_multiple_frames_averaged(self):
         f1 = make_current({"nose_y": 0.30})
         f2 = make_current({"nose_y": 0.40})
         result = average_metrics([f1, f2])
-        self.assertAlmostEqual(result["nose_y"], 0.35, places=6)
+        self.assertAlmostEqual(result.nose_y, 0.35, places=6)
 
     def test_output_values_are_floats(self):
         result = average_metrics([make_baseline()])
-        for val in result.values():
+        self.assertIsInstance(result, Metrics)
+        for val in result:
             self.assertIsInstance(val, float)
 
 
@@ -249,5 +552,30 @@ class TestSmoothScore(unittest.TestCase):
         self.assertIsInstance(result, int)
 
 
+class TestScoreHistory(unittest.TestCase):
+    """Tests for ScoreHistory."""
+
+    def test_matches_smooth_score(self):
+        history = ScoreHistory(max_len=5)
+        reference = []
+        for s in [100, 40, 73, 88, 12, 99, 61, 50]:
+            self.assertEqual(history.push(s), smooth_score(reference, s, max_len=5))
+        self.assertEqual(list(history), reference)
+
+    def test_max_len_enforced(self):
+        history = ScoreHistory(max_len=3)
+        for s in range(10):
+            history.push(s)
+        self.assertEqual(list(history), [7, 8, 9])
+        self.assertEqual(history.push(10), 9)
+
+    def test_clear_resets_mean(self):
+        history = ScoreHistory()
+        history.push(10)
+        history.clear()
+        self.assertEqual(len(history), 0)
+        self.assertEqual(history.push(90), 90)
+
+
 if __name__ == "__main__":
     unittest.main()